@@ -1,5 +1,6 @@
+import heapq
 import sys
-from collections import deque
+from collections import Counter, deque
 
 from crossword import *
 
@@ -15,6 +16,22 @@ class CrosswordCreator():
             var: self.crossword.words.copy()
             for var in self.crossword.variables
         }
+        self._removed = None
+
+        # Cache the constraint graph, which never changes while solving
+        self._neighbors = {
+            var: frozenset(self.crossword.neighbors(var))
+            for var in self.crossword.variables
+        }
+        self._overlap = {
+            (var, neighbor): self.crossword.overlaps[var, neighbor]
+            for var in self.crossword.variables
+            for neighbor in self._neighbors[var]
+        }
+        self._degree = {
+            var: len(self._neighbors[var])
+            for var in self.crossword.variables
+        }
 
     def letter_grid(self, assignment):
         """
@@ -101,15 +118,29 @@ class CrosswordCreator():
          constraints; in this case, the length of the word.)
         """
         for var in self.domains:
-            # Create a copy of the domain to iterate over
-            words_to_remove = set()
-            for word in self.domains[var]:
-                if len(word) != var.length:
-                    words_to_remove.add(word)
-            
-            # Remove words that don't match the length constraint
-            for word in words_to_remove:
-                self.domains[var].remove(word)
+            # Keep only words that match the length constraint
+            self.domains[var] = {
+                word for word in self.domains[var]
+                if len(word) == var.length
+            }
+
+    def _remove_value(self, var, word):
+        """
+        Remove `word` from the domain of `var`. While backtracking, the
+        removal is recorded in `self._removed` so it can be undone.
+        """
+        self.domains[var].remove(word)
+        if self._removed is not None:
+            self._removed.append((var, word))
+
+    def _restore_values(self, mark):
+        """
+        Undo every removal recorded in `self._removed` after the first
+        `mark` entries, restoring those words to their domains.
+        """
+        while len(self._removed) > mark:
+            var, word = self._removed.pop()
+            self.domains[var].add(word)
 
     def revise(self, x, y):
         """
@@ -121,7 +152,7 @@ class CrosswordCreator():
         False if no revision was made.
         """
         revised = False
-        overlap = self.crossword.overlaps[x, y]
+        overlap = self._overlap.get((x, y))
         
         # If there's no overlap, no revision needed
         if overlap is None:
@@ -129,24 +160,19 @@ class CrosswordCreator():
         
         i, j = overlap  # i is index in x's word, j is index in y's word
         
-        # Check each word in x's domain
-        words_to_remove = set()
-        for word_x in self.domains[x]:
-            # Check if there's any word in y's domain that is consistent
-            consistent_found = False
-            for word_y in self.domains[y]:
-                if word_x[i] == word_y[j]:
-                    consistent_found = True
-                    break
-            
-            # If no consistent word found in y's domain, remove word_x
-            if not consistent_found:
-                words_to_remove.add(word_x)
-                revised = True
-        
+        # Letters that some word in y's domain has at the overlap
+        valid_letters = {word_y[j] for word_y in self.domains[y]}
+
+        # Find words in x's domain that no word in y's domain supports
+        words_to_remove = [
+            word_x for word_x in self.domains[x]
+            if word_x[i] not in valid_letters
+        ]
+
         # Remove inconsistent words
         for word in words_to_remove:
-            self.domains[x].remove(word)
+            self._remove_value(x, word)
+            revised = True
         
         return revised
 
@@ -161,11 +187,11 @@ class CrosswordCreator():
         """
         # Initialize queue with all arcs if not provided
         if arcs is None:
-            queue = deque()
-            for v1 in self.crossword.variables:
-                for v2 in self.crossword.variables:
-                    if v1 != v2 and self.crossword.overlaps[v1, v2] is not None:
-                        queue.append((v1, v2))
+            queue = deque(
+                (v1, v2)
+                for v1 in self.crossword.variables
+                for v2 in self._neighbors[v1]
+            )
         else:
             queue = deque(arcs)
         
@@ -178,7 +204,7 @@ class CrosswordCreator():
                     return False
                 
                 # Add all arcs (k, x) where k is neighbor of x (except y)
-                for k in self.crossword.neighbors(x):
+                for k in self._neighbors[x]:
                     if k != y:
                         queue.append((k, x))
         
@@ -208,13 +234,11 @@ class CrosswordCreator():
         
         # Check for conflicts between neighboring variables
         for var1, word1 in assignment.items():
-            for var2, word2 in assignment.items():
-                if var1 != var2:
-                    overlap = self.crossword.overlaps[var1, var2]
-                    if overlap is not None:
-                        i, j = overlap
-                        if word1[i] != word2[j]:
-                            return False
+            for var2 in self._neighbors[var1]:
+                if var2 in assignment:
+                    i, j = self._overlap[var1, var2]
+                    if word1[i] != assignment[var2][j]:
+                        return False
         
         return True
 
@@ -225,22 +249,46 @@ class CrosswordCreator():
         The first value in the list, for example, should be the one
         that rules out the fewest values among the neighbors of `var`.
         """
+        # Sort domain values by number of eliminated values (ascending)
+        return [word for _, word in sorted(self._elimination_counts(var, assignment))]
+
+    def _ordered_domain_values(self, var, assignment):
+        """
+        Yield the values in the domain of `var` in the same order as
+        `order_domain_values`, popping them lazily from a heap so the tail
+        is never sorted if an early value leads to a solution.
+        """
+        keys = self._elimination_counts(var, assignment)
+        heapq.heapify(keys)
+        while keys:
+            yield heapq.heappop(keys)[1]
+
+    def _elimination_counts(self, var, assignment):
+        """
+        Return a list of (count, word) pairs for the values in the domain
+        of `var`, where count is the number of values the word rules out
+        for the unassigned neighbors of `var`.
+        """
+        # For each unassigned neighbor, the overlap and the histogram of
+        # letters its domain has there
+        unassigned_neighbors = []
+        for neighbor in self._neighbors[var]:
+            if neighbor not in assignment:
+                i, j = self._overlap[var, neighbor]
+                letters = Counter(word[j] for word in self.domains[neighbor])
+                unassigned_neighbors.append(
+                    (i, letters, len(self.domains[neighbor]))
+                )
+
         def count_eliminated_values(word):
+            # Every neighbor word without word's letter at the overlap
+            # would be eliminated
             count = 0
-            # Check each unassigned neighbor
-            for neighbor in self.crossword.neighbors(var):
-                if neighbor not in assignment:
-                    overlap = self.crossword.overlaps[var, neighbor]
-                    if overlap is not None:
-                        i, j = overlap
-                        # Count how many values in neighbor's domain would be eliminated
-                        for neighbor_word in self.domains[neighbor]:
-                            if word[i] != neighbor_word[j]:
-                                count += 1
+            for i, letters, size in unassigned_neighbors:
+                count += size - letters[word[i]]
             return count
-        
-        # Sort domain values by number of eliminated values (ascending)
-        return sorted(self.domains[var], key=count_eliminated_values)
+
+        return [(count_eliminated_values(word), word) for word in self.domains[var]]
 
     def select_unassigned_variable(self, assignment):
         """
@@ -250,25 +298,51 @@ class CrosswordCreator():
         degree. If there is a tie, any of the tied variables are acceptable
         return values.
         """
-        unassigned_vars = [var for var in self.crossword.variables if var not in assignment]
+        unassigned_vars = self.crossword.variables - assignment.keys()
         
         # Sort by minimum remaining values (ascending), then by degree (descending)
         def sort_key(var):
-            remaining_values = len(self.domains[var])
-            degree = len(self.crossword.neighbors(var))
-            return (remaining_values, -degree)  # negative degree for descending order
+            return (len(self.domains[var]), -self._degree[var])
         
         return min(unassigned_vars, key=sort_key)
 
-    def backtrack(self, assignment):
+    def _consistent_with(self, var, word, assignment, used):
+        """
+        Return True if assigning `word` to `var` keeps an already consistent
+        `assignment` consistent; return False otherwise. `used` is the set
+        of words already in `assignment`.
+        """
+        # Check that the word is distinct and has the correct length
+        if word in used or len(word) != var.length:
+            return False
+
+        # Only neighbors of `var` that are already assigned can conflict
+        for neighbor in self._neighbors[var]:
+            if neighbor in assignment:
+                i, j = self._overlap[var, neighbor]
+                if word[i] != assignment[neighbor][j]:
+                    return False
+
+        return True
+
+    def backtrack(self, assignment, used=None):
         """
         Using Backtracking Search, take as input a partial assignment for the
         crossword and return a complete assignment if possible to do so.
 
         `assignment` is a mapping from variables (keys) to words (values).
+        `used` is the set of words in `assignment`, built if not provided.
 
         If no assignment is possible, return None.
         """
+        if used is None:
+            # Record domain removals on a trail only for this search
+            self._removed = []
+            try:
+                return self.backtrack(assignment, set(assignment.values()))
+            finally:
+                self._removed = None
+
         # If assignment is complete, return it
         if self.assignment_complete(assignment):
             return assignment
@@ -277,19 +351,35 @@ class CrosswordCreator():
         var = self.select_unassigned_variable(assignment)
         
         # Try each value in the domain of the selected variable
-        for value in self.order_domain_values(var, assignment):
+        for value in self._ordered_domain_values(var, assignment):
+            # Check if the new value is consistent with the assignment
+            if not self._consistent_with(var, value, assignment, used):
+                continue
+
             # Add the assignment
             assignment[var] = value
-            
-            # Check if assignment is consistent
-            if self.consistent(assignment):
+            used.add(value)
+
+            # Maintain arc consistency: reduce the domain of `var` to the
+            # chosen value and propagate to its unassigned neighbors
+            mark = len(self._removed)
+            for word in [w for w in self.domains[var] if w != value]:
+                self._remove_value(var, word)
+            arcs = [
+                (neighbor, var)
+                for neighbor in self._neighbors[var]
+                if neighbor not in assignment
+            ]
+            if self.ac3(arcs):
                 # Recursively try to complete the assignment
-                result = self.backtrack(assignment)
+                result = self.backtrack(assignment, used)
                 if result is not None:
                     return result
             
-            # Remove the assignment (backtrack)
+            # Remove the assignment and inferences (backtrack)
+            self._restore_values(mark)
             del assignment[var]
+            used.remove(value)
         
         # No solution found
         return None
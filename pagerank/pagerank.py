@@ -1,11 +1,15 @@
 import os
-import random
 import re
 import sys
 
+import numpy as np
+
 DAMPING = 0.85
 SAMPLES = 10000
 
+# Links are matched on the raw bytes of each file; only hrefs are decoded
+LINK_PATTERN = re.compile(rb"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
+
 
 def main():
     if len(sys.argv) != 2:
@@ -33,17 +37,14 @@ def crawl(directory):
     for filename in os.listdir(directory):
         if not filename.endswith(".html"):
             continue
-        with open(os.path.join(directory, filename)) as f:
+        with open(os.path.join(directory, filename), "rb") as f:
             contents = f.read()
-            links = re.findall(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"", contents)
-            pages[filename] = set(links) - {filename}
+            links = {link.decode() for link in LINK_PATTERN.findall(contents)}
+            pages[filename] = links - {filename}
 
     # Only include links to other pages in the corpus
     for filename in pages:
-        pages[filename] = set(
-            link for link in pages[filename]
-            if link in pages
-        )
+        pages[filename] = pages[filename].intersection(pages)
 
     return pages
 
@@ -57,24 +58,19 @@ def transition_model(corpus, page, damping_factor):
     linked to by `page`. With probability `1 - damping_factor`, choose
     a link at random chosen from all pages in the corpus.
     """
-    # Initialize probability distribution with equal probability for all pages
-    # This represents the (1 - damping_factor) portion where we randomly jump to any page
     total_pages = len(corpus)
-    prob_distribution = {}
-    
-    # Start with base probability for random jumps (1 - damping_factor) / N
-    base_prob = (1 - damping_factor) / total_pages
-    for p in corpus:
-        prob_distribution[p] = base_prob
-    
+
     # Get the links from the current page
     links = corpus[page]
     
     # If the page has no outgoing links, treat it as linking to all pages
     if not links:
         # Equal probability for all pages (including current page)
-        equal_prob = 1.0 / total_pages
-        return {p: equal_prob for p in corpus}
+        return dict.fromkeys(corpus, 1.0 / total_pages)
+    
+    # Start with base probability for random jumps (1 - damping_factor) / N
+    # This represents the (1 - damping_factor) portion where we randomly jump to any page
+    prob_distribution = dict.fromkeys(corpus, (1 - damping_factor) / total_pages)
     
     # Add the damping_factor portion: probability of following a link
     link_prob = damping_factor / len(links)
@@ -93,29 +89,36 @@ def sample_pagerank(corpus, damping_factor, n):
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
+    pages = list(corpus)
+    total_pages = len(pages)
+
+    # Precompute each page's transition distribution once, as cumulative
+    # weights, so each sample is a single binary search instead of a call
+    # to transition_model
+    weights = np.empty((total_pages, total_pages), dtype=np.float64)
+    for i, page in enumerate(pages):
+        probabilities = transition_model(corpus, page, damping_factor)
+        weights[i] = [probabilities[p] for p in pages]
+    cumulative = np.cumsum(weights, axis=1)
+    cumulative /= cumulative[:, -1:]
+
     # Initialize page visit counts
-    page_counts = {page: 0 for page in corpus}
-    
-    # Start with a random page
-    current_page = random.choice(list(corpus.keys()))
-    page_counts[current_page] += 1
-    
-    # Generate n-1 more samples (we already have 1 from the initial random choice)
-    for _ in range(n - 1):
-        # Get transition probabilities from current page
-        probabilities = transition_model(corpus, current_page, damping_factor)
-        
+    page_counts = np.zeros(total_pages, dtype=np.int64)
+
+    # Start with a random page, then draw all remaining steps up front
+    rng = np.random.default_rng()
+    current = rng.integers(total_pages)
+    draws = rng.random(n)
+
+    for k in range(n):
+        page_counts[current] += 1
+
         # Choose next page based on the probability distribution
-        pages = list(probabilities.keys())
-        weights = [probabilities[page] for page in pages]
-        current_page = random.choices(pages, weights=weights)[0]
-        
-        # Increment count for the chosen page
-        page_counts[current_page] += 1
-    
+        current = cumulative[current].searchsorted(draws[k], side="right")
+
     # Convert counts to probabilities (normalize by total samples)
-    pagerank = {page: count / n for page, count in page_counts.items()}
-    
+    pagerank = dict(zip(pages, (page_counts / n).tolist()))
+
     return pagerank
 
 
@@ -128,47 +131,50 @@ def iterate_pagerank(corpus, damping_factor):
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
-    total_pages = len(corpus)
-    
+    pages = list(corpus)
+    index = {page: i for i, page in enumerate(pages)}
+    total_pages = len(pages)
+
+    # Store the link graph as parallel edge arrays: each link from page
+    # `source` to page `target` carries weight 1 / (links on source)
+    sources = []
+    targets = []
+    weights = []
+    dangling = np.zeros(total_pages, dtype=bool)
+    for i, page in enumerate(pages):
+        links = corpus[page]
+
+        # A page with no outgoing links is treated as linking to all pages
+        if not links:
+            dangling[i] = True
+        for link in links:
+            sources.append(i)
+            targets.append(index[link])
+            weights.append(1.0 / len(links))
+    sources = np.array(sources, dtype=np.intp)
+    targets = np.array(targets, dtype=np.intp)
+    weights = np.array(weights, dtype=np.float64)
+
     # Initialize each page with equal PageRank (1/N)
-    pagerank = {page: 1 / total_pages for page in corpus}
-    
-    # Iterate until convergence
+    pagerank = np.full(total_pages, 1.0 / total_pages)
+
+    # Iterate until convergence (no value changes by more than 0.001)
     while True:
-        new_pagerank = {}
-        
-        for page in corpus:
-            # Start with the random jump probability: (1-d)/N
-            rank = (1 - damping_factor) / total_pages
-            
-            # Add contributions from all pages in the corpus
-            for linking_page in corpus:
-                links_from_linking_page = corpus[linking_page]
-                
-                # If linking page has no outgoing links, treat as linking to all pages
-                if not links_from_linking_page:
-                    # Page with no links contributes to ALL pages equally
-                    rank += damping_factor * pagerank[linking_page] / total_pages
-                else:
-                    # Only add contribution if this linking_page actually links to current page
-                    if page in links_from_linking_page:
-                        rank += damping_factor * pagerank[linking_page] / len(links_from_linking_page)
-            
-            new_pagerank[page] = rank
-        
-        # Check for convergence (no value changes by more than 0.001)
-        converged = True
-        for page in corpus:
-            if abs(new_pagerank[page] - pagerank[page]) > 0.001:
-                converged = False
-                break
-        
+        # Random jumps and dangling pages spread rank evenly; links add
+        # their source's rank to each target
+        base = (1 - damping_factor) / total_pages
+        base += damping_factor * pagerank[dangling].sum() / total_pages
+        linked = np.bincount(
+            targets, weights=weights * pagerank[sources], minlength=total_pages
+        )
+        new_pagerank = base + damping_factor * linked
+
+        converged = np.max(np.abs(new_pagerank - pagerank)) <= 0.001
         pagerank = new_pagerank
-        
         if converged:
             break
-    
-    return pagerank
+
+    return dict(zip(pages, pagerank.tolist()))
 
 
 if __name__ == "__main__":
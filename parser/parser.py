@@ -93,7 +93,7 @@ def preprocess(sentence):
     result = []
     for word in words:
         # Check if word contains at least one alphabetic character
-        if any(char.isalpha() for char in word):
+        if any(map(str.isalpha, word)):
             result.append(word.lower())
     
     return result
@@ -109,28 +109,26 @@ def np_chunk(tree):
     chunks = []
     
     def find_np_chunks(subtree):
-        # If this subtree is labeled NP
+        """
+        Collect NP chunks below `subtree` and return True if `subtree`
+        is or contains a noun phrase.
+        """
+        # Leaves (words) are not noun phrases
+        if not hasattr(subtree, 'label'):
+            return False
+
+        # Visit every child, noting whether any of them contains an NP
+        contains_np = False
+        for child in subtree:
+            if find_np_chunks(child):
+                contains_np = True
+
+        # An NP that doesn't contain other NPs is a chunk
         if subtree.label() == "NP":
-            # Check if it contains any NP subtrees
-            contains_np = False
-            for child in subtree.subtrees():
-                if child != subtree and child.label() == "NP":
-                    contains_np = True
-                    break
-            
-            # If it doesn't contain other NPs, it's a chunk
             if not contains_np:
                 chunks.append(subtree)
-            else:
-                # If it contains other NPs, recursively search its children
-                for child in subtree:
-                    if hasattr(child, 'label'):
-                        find_np_chunks(child)
-        else:
-            # If not an NP, search its children
-            for child in subtree:
-                if hasattr(child, 'label'):
-                    find_np_chunks(child)
+            return True
+        return contains_np
     
     find_np_chunks(tree)
     return chunks
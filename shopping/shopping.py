@@ -1,11 +1,21 @@
-import csv
 import sys
 
+import numpy as np
+import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.neighbors import KNeighborsClassifier
 
 TEST_SIZE = 0.4
 
+EVIDENCE_COLUMNS = [
+    'Administrative', 'Administrative_Duration',
+    'Informational', 'Informational_Duration',
+    'ProductRelated', 'ProductRelated_Duration',
+    'BounceRates', 'ExitRates', 'PageValues', 'SpecialDay', 'Month',
+    'OperatingSystems', 'Browser', 'Region', 'TrafficType',
+    'VisitorType', 'Weekend'
+]
+
 
 def main():
 
@@ -33,10 +43,10 @@ def main():
 
 def load_data(filename):
     """
-    Load shopping data from a CSV file `filename` and convert into a list of
-    evidence lists and a list of labels. Return a tuple (evidence, labels).
+    Load shopping data from a CSV file `filename` and convert into an array
+    of evidence rows and an array of labels. Return a tuple (evidence, labels).
 
-    evidence should be a list of lists, where each list contains the
+    evidence should be a 2-D float array, where each row contains the
     following values, in order:
         - Administrative, an integer
         - Administrative_Duration, a floating point number
@@ -56,12 +66,9 @@ def load_data(filename):
         - VisitorType, an integer 0 (not returning) or 1 (returning)
         - Weekend, an integer 0 (if false) or 1 (if true)
 
-    labels should be the corresponding list of labels, where each label
+    labels should be the corresponding array of labels, where each label
     is 1 if Revenue is true, and 0 otherwise.
     """
-    evidence = []
-    labels = []
-    
     # Month name to index mapping (handle both abbreviated and full names)
     month_to_index = {
         'Jan': 0, 'Feb': 1, 'Mar': 2, 'Apr': 3, 'May': 4, 'Jun': 5,
@@ -69,71 +76,24 @@ def load_data(filename):
         'January': 0, 'February': 1, 'March': 2, 'April': 3, 'May': 4, 'June': 5,
         'July': 6, 'August': 7, 'September': 8, 'October': 9, 'November': 10, 'December': 11
     }
-    
-    with open(filename, 'r') as file:
-        reader = csv.reader(file)
-        header = next(reader)  # Skip the header row
-        
-        for row in reader:
-            # Parse each column according to the specification
-            evidence_row = []
-            
-            # Administrative (int)
-            evidence_row.append(int(row[0]))
-            
-            # Administrative_Duration (float)
-            evidence_row.append(float(row[1]))
-            
-            # Informational (int)
-            evidence_row.append(int(row[2]))
-            
-            # Informational_Duration (float)
-            evidence_row.append(float(row[3]))
-            
-            # ProductRelated (int)
-            evidence_row.append(int(row[4]))
-            
-            # ProductRelated_Duration (float)
-            evidence_row.append(float(row[5]))
-            
-            # BounceRates (float)
-            evidence_row.append(float(row[6]))
-            
-            # ExitRates (float)
-            evidence_row.append(float(row[7]))
-            
-            # PageValues (float)
-            evidence_row.append(float(row[8]))
-            
-            # SpecialDay (float)
-            evidence_row.append(float(row[9]))
-            
-            # Month (convert to index 0-11)
-            evidence_row.append(month_to_index[row[10]])
-            
-            # OperatingSystems (int)
-            evidence_row.append(int(row[11]))
-            
-            # Browser (int)
-            evidence_row.append(int(row[12]))
-            
-            # Region (int)
-            evidence_row.append(int(row[13]))
-            
-            # TrafficType (int)
-            evidence_row.append(int(row[14]))
-            
-            # VisitorType (1 for Returning_Visitor, 0 otherwise)
-            evidence_row.append(1 if row[15] == 'Returning_Visitor' else 0)
-            
-            # Weekend (1 for TRUE, 0 for FALSE)
-            evidence_row.append(1 if row[16] == 'TRUE' else 0)
-            
-            evidence.append(evidence_row)
-            
-            # Revenue label (1 for TRUE, 0 for FALSE)
-            labels.append(1 if row[17] == 'TRUE' else 0)
-    
+
+    # Parse the whole file at once; TRUE/FALSE columns are read as booleans
+    df = pd.read_csv(filename, true_values=['TRUE'], false_values=['FALSE'])
+
+    # Month (convert to index 0-11)
+    df['Month'] = df['Month'].map(month_to_index)
+
+    # VisitorType (1 for Returning_Visitor, 0 otherwise)
+    df['VisitorType'] = (df['VisitorType'] == 'Returning_Visitor').astype(np.uint8)
+
+    # Weekend (1 for TRUE, 0 for FALSE)
+    df['Weekend'] = df['Weekend'].astype(np.uint8)
+
+    evidence = np.ascontiguousarray(df[EVIDENCE_COLUMNS].to_numpy(dtype=np.float64))
+
+    # Revenue label (1 for TRUE, 0 for FALSE)
+    labels = df['Revenue'].to_numpy(dtype=np.int8)
+
     return (evidence, labels)
 
 
@@ -142,8 +102,11 @@ def train_model(evidence, labels):
     Given a list of evidence lists and a list of labels, return a
     fitted k-nearest neighbor model (k=1) trained on the data.
     """
-    # Create a k-nearest neighbor classifier with k=1
-    model = KNeighborsClassifier(n_neighbors=1)
+    # Create a k-nearest neighbor classifier with k=1, using a KD-tree for
+    # neighbor queries and all available cores for prediction
+    model = KNeighborsClassifier(
+        n_neighbors=1, algorithm='kd_tree', leaf_size=40, n_jobs=-1
+    )
     
     # Fit the model on the training data
     model.fit(evidence, labels)
@@ -166,32 +129,19 @@ def evaluate(labels, predictions):
     representing the "true negative rate": the proportion of
     actual negative labels that were accurately identified.
     """
-    # Count true positives, false positives, true negatives, false negatives
-    true_positives = 0
-    false_positives = 0
-    true_negatives = 0
-    false_negatives = 0
-    
-    for actual, predicted in zip(labels, predictions):
-        if actual == 1 and predicted == 1:
-            true_positives += 1
-        elif actual == 0 and predicted == 1:
-            false_positives += 1
-        elif actual == 0 and predicted == 0:
-            true_negatives += 1
-        elif actual == 1 and predicted == 0:
-            false_negatives += 1
-    
+    labels = np.asarray(labels)
+    predictions = np.asarray(predictions)
+
     # Calculate sensitivity (true positive rate)
     # Sensitivity = TP / (TP + FN)
-    sensitivity = true_positives / \
-        (true_positives + false_negatives) if (true_positives + false_negatives) > 0 else 0
-    
+    positives = labels == 1
+    sensitivity = float((predictions[positives] == 1).mean()) if positives.any() else 0
+
     # Calculate specificity (true negative rate)
     # Specificity = TN / (TN + FP)
-    specificity = true_negatives / \
-        (true_negatives + false_positives) if (true_negatives + false_positives) > 0 else 0
-    
+    negatives = labels == 0
+    specificity = float((predictions[negatives] == 0).mean()) if negatives.any() else 0
+
     return (sensitivity, specificity)
 
 
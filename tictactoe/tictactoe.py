@@ -2,13 +2,72 @@
 Tic Tac Toe Player
 """
 
-import math
-import copy
+import functools
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Bitboards: each player's marks are a 9-bit mask where cell (i, j) is
+# bit 3 * i + j. These are the masks of the rows, columns and diagonals.
+LINES = (0o007, 0o070, 0o700, 0o111, 0o222, 0o444, 0o421, 0o124)
+FULL = 0o777
+
+# WIN[mask] is 1 if the 9-bit mask covers a whole line, 0 otherwise
+WIN = bytearray(
+    any(mask & line == line for line in LINES) for mask in range(FULL + 1)
+)
+
+# Range of utility values. Searches start with this as their alpha-beta
+# window, so a node stops as soon as its player finds a winning move,
+# and the search only ever handles small ints.
+MIN_UTILITY, MAX_UTILITY = -1, 1
+
+# Cell indices in the order moves are tried: center, corners, then edges.
+# Trying strong moves first lets alpha-beta prune more of the tree.
+ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# The 8 symmetries of the board (rotations and reflections). Each maps
+# cell index k to the index of the cell it moves to.
+SYMMETRIES = tuple(
+    tuple(transform(k // 3, k % 3) for k in range(9))
+    for transform in (
+        lambda i, j: 3 * i + j,              # identity
+        lambda i, j: 3 * j + 2 - i,          # rotate 90 degrees
+        lambda i, j: 3 * (2 - i) + 2 - j,    # rotate 180 degrees
+        lambda i, j: 3 * (2 - j) + i,        # rotate 270 degrees
+        lambda i, j: 3 * i + 2 - j,          # mirror left-right
+        lambda i, j: 3 * (2 - i) + j,        # mirror top-bottom
+        lambda i, j: 3 * j + i,              # transpose
+        lambda i, j: 3 * (2 - j) + 2 - i,    # anti-transpose
+    )
+)
+INVERSE_SYMMETRIES = tuple(
+    tuple(sorted(range(9), key=symmetry.__getitem__))
+    for symmetry in SYMMETRIES
+)
+
+# For each symmetry, the image of every possible 9-bit mask
+SYMMETRY_TABLES = tuple(
+    tuple(
+        sum(1 << symmetry[k] for k in range(9) if mask >> k & 1)
+        for mask in range(FULL + 1)
+    )
+    for symmetry in SYMMETRIES
+)
+
+# Transposition table: maps a position's key to (value, flag, best move).
+# The flag records whether value is exact or only a lower/upper bound,
+# since alpha-beta cuts a search short once the value is out of its window.
+# Keys are canonical under the board's symmetries, and moves are stored
+# as cells of the canonical board.
+TT = {}
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Optimal move for every reachable non-terminal position, keyed and
+# stored like the transposition table. Filled by build_policy() at import.
+POLICY = {}
+
 
 def initial_state():
     """
@@ -23,21 +82,14 @@ def player(board):
     """
     Returns player who has the next turn on a board.
     """
-    x_count = sum(row.count(X) for row in board)
-    o_count = sum(row.count(O) for row in board)
-    return O if x_count > o_count else X
+    return player_bb(*to_bitboard(board))
 
 
 def actions(board):
     """
     Returns set of all possible actions (i, j) available on the board.
     """
-    possible_actions = set()
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == EMPTY:
-                possible_actions.add((i, j))
-    return possible_actions
+    return {divmod(k, 3) for k in actions_bb(*to_bitboard(board))}
 
 
 def result(board, action):
@@ -45,10 +97,11 @@ def result(board, action):
     Returns the board that results from making move (i, j) on the board.
     """
     i, j = action
-    if i not in range(3) or j not in range(3) or board[i][j] != EMPTY:
+    if not (0 <= i < 3 and 0 <= j < 3) or board[i][j] is not EMPTY:
         raise Exception("Invalid action")
     
-    new_board = copy.deepcopy(board)
+    # Cells are immutable, so copying each row is enough
+    new_board = [board[0][:], board[1][:], board[2][:]]
     new_board[i][j] = player(board)
     return new_board
 
@@ -57,106 +110,257 @@ def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    # Check rows
-    for row in board:
-        if row == [X, X, X]:
-            return X
-        if row == [O, O, O]:
-            return O
-    
-    # Check columns
-    for j in range(3):
-        if [board[i][j] for i in range(3)] == [X, X, X]:
-            return X
-        if [board[i][j] for i in range(3)] == [O, O, O]:
-            return O
-    
-    # Check diagonals
-    if [board[i][i] for i in range(3)] == [X, X, X]:
-        return X
-    if [board[i][i] for i in range(3)] == [O, O, O]:
-        return O
-    if [board[0][2], board[1][1], board[2][0]] == [X, X, X]:
-        return X
-    if [board[0][2], board[1][1], board[2][0]] == [O, O, O]:
-        return O
-    
-    return None
+    return winner_bb(*to_bitboard(board))
 
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    if winner(board) is not None:
-        return True
-    if all(cell != EMPTY for row in board for cell in row):
-        return True
-    return False
+    return terminal_bb(*to_bitboard(board))
 
 
 def utility(board):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    winner_result = winner(board)
+    return utility_bb(*to_bitboard(board))
+
+
+def to_bitboard(board):
+    """
+    Returns the board as a pair of bitboards (x, o).
+    """
+    x = o = 0
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell == X:
+                x |= 1 << (3 * i + j)
+            elif cell == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def player_bb(x, o):
+    """
+    Returns player who has the next turn on a bitboard.
+    """
+    return O if x.bit_count() > o.bit_count() else X
+
+
+@functools.lru_cache(maxsize=None)
+def actions_bb(x, o):
+    """
+    Returns a tuple of the index 3 * i + j of every empty cell on a bitboard,
+    in move ordering.
+    """
+    occupied = x | o
+    return tuple(move for move in ORDER if not occupied >> move & 1)
+
+
+def result_bb(x, o, move, turn):
+    """
+    Returns the bitboard that results from `turn` marking cell index `move`.
+    """
+    bit = 1 << move
+    return (x | bit, o) if turn == X else (x, o | bit)
+
+
+def winner_bb(x, o):
+    """
+    Returns the winner of the game on a bitboard, if there is one.
+    """
+    if WIN[x]:
+        return X
+    if WIN[o]:
+        return O
+    return None
+
+
+def terminal_bb(x, o):
+    """
+    Returns True if the game on a bitboard is over, False otherwise.
+    """
+    return evaluate_bb(x, o)[0]
+
+
+def utility_bb(x, o):
+    """
+    Returns 1 if X has won the game on a bitboard, -1 if O has won, 0 otherwise.
+    """
+    return evaluate_bb(x, o)[1]
+
+
+@functools.lru_cache(maxsize=None)
+def evaluate_bb(x, o):
+    """
+    Returns (True, utility) if the game on a bitboard is over, and
+    (False, 0) otherwise, checking for a winner only once.
+    """
+    winner_result = winner_bb(x, o)
     if winner_result == X:
-        return 1
+        return True, 1
     if winner_result == O:
-        return -1
-    return 0
+        return True, -1
+    return (x | o) == FULL, 0
 
 
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
-    if terminal(board):
+    x, o = to_bitboard(board)
+    if terminal_bb(x, o):
         return None
+
+    # Every position reachable in play is in the precomputed policy
+    key, symmetry = canonical(x, o)
+    if key in POLICY:
+        move = POLICY[key]
+        return divmod(INVERSE_SYMMETRIES[symmetry][move], 3)
     
-    current_player = player(board)
+    current_player = player_bb(x, o)
     
     if current_player == X:
-        value, move = max_value(board)
+        value, move = max_value(x, o, MIN_UTILITY, MAX_UTILITY)
     else:
-        value, move = min_value(board)
+        value, move = min_value(x, o, MIN_UTILITY, MAX_UTILITY)
     
-    return move
+    return divmod(move, 3)
 
 
-def max_value(board):
+def build_policy():
     """
-    Returns the maximum utility and best move for X.
+    Fills POLICY with the best move of every non-terminal position
+    reachable from the initial state.
     """
-    if terminal(board):
-        return utility(board), None
+    def visit(x, o, turn):
+        key, symmetry = canonical(x, o)
+        if key in POLICY or terminal_bb(x, o):
+            return
+        if turn == X:
+            _, move = max_value(x, o, MIN_UTILITY, MAX_UTILITY)
+        else:
+            _, move = min_value(x, o, MIN_UTILITY, MAX_UTILITY)
+        POLICY[key] = SYMMETRIES[symmetry][move]
+        for move in actions_bb(x, o):
+            visit(*result_bb(x, o, move, turn), O if turn == X else X)
+
+    visit(*to_bitboard(initial_state()), X)
+
+
+@functools.lru_cache(maxsize=None)
+def canonical(x, o):
+    """
+    Returns (key, symmetry) for a bitboard, where key is the smallest
+    packed board among its 8 symmetric variants, and symmetry is the
+    index of the symmetry that produces it. The player to move follows
+    from the number of marks, so it need not be part of the key.
+    """
+    return min(
+        (table[x] | table[o] << 9, symmetry)
+        for symmetry, table in enumerate(SYMMETRY_TABLES)
+    )
+
+
+def tt_store(key, v, best_move, alpha, beta):
+    """
+    Stores the result of a search that began with window (alpha, beta).
+    """
+    if v <= alpha:
+        TT[key] = (v, UPPER, best_move)
+    elif v >= beta:
+        TT[key] = (v, LOWER, best_move)
+    else:
+        TT[key] = (v, EXACT, best_move)
+
+
+def max_value(x, o, alpha, beta):
+    """
+    Returns the maximum utility and best move (a cell index) for X.
+    `alpha` and `beta` bound the values that can still affect the result;
+    once a move reaches `beta`, the remaining moves are pruned.
+    """
+    done, value = evaluate_bb(x, o)
+    if done:
+        return value, None
     
-    v = -math.inf
+    v = MIN_UTILITY - 1
     best_move = None
+    alpha_orig, beta_orig = alpha, beta
+
+    # Reuse a previous search of this position, or a symmetric one
+    key, symmetry = canonical(x, o)
+    hit = TT.get(key)
+    if hit is not None:
+        value, flag, move = hit
+        move = INVERSE_SYMMETRIES[symmetry][move]
+        if flag == EXACT:
+            return value, move
+        if flag == LOWER:
+            # The stored move is known to reach at least `value`
+            v, best_move = value, move
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value, move
     
-    for action in actions(board):
-        min_val, _ = min_value(result(board, action))
+    for move in actions_bb(x, o):
+        min_val, _ = min_value(*result_bb(x, o, move, X), alpha, beta)
         if min_val > v:
             v = min_val
-            best_move = action
+            best_move = move
+        if v >= beta:
+            break
+        alpha = max(alpha, v)
     
+    tt_store(key, v, SYMMETRIES[symmetry][best_move], alpha_orig, beta_orig)
     return v, best_move
 
 
-def min_value(board):
+def min_value(x, o, alpha, beta):
     """
-    Returns the minimum utility and best move for O.
+    Returns the minimum utility and best move (a cell index) for O.
+    `alpha` and `beta` bound the values that can still affect the result;
+    once a move reaches `alpha`, the remaining moves are pruned.
     """
-    if terminal(board):
-        return utility(board), None
+    done, value = evaluate_bb(x, o)
+    if done:
+        return value, None
    
-    v = math.inf
+    v = MAX_UTILITY + 1
     best_move = None
+    alpha_orig, beta_orig = alpha, beta
+
+    # Reuse a previous search of this position, or a symmetric one
+    key, symmetry = canonical(x, o)
+    hit = TT.get(key)
+    if hit is not None:
+        value, flag, move = hit
+        move = INVERSE_SYMMETRIES[symmetry][move]
+        if flag == EXACT:
+            return value, move
+        if flag == UPPER:
+            # The stored move is known to reach at most `value`
+            v, best_move = value, move
+            beta = min(beta, value)
+        else:
+            alpha = max(alpha, value)
+        if alpha >= beta:
+            return value, move
  
-    for action in actions(board):
-        max_val, _ = max_value(result(board, action))
+    for move in actions_bb(x, o):
+        max_val, _ = max_value(*result_bb(x, o, move, O), alpha, beta)
         if max_val < v:
             v = max_val
-            best_move = action
+            best_move = move
+        if v <= alpha:
+            break
+        beta = min(beta, v)
  
+    tt_store(key, v, SYMMETRIES[symmetry][best_move], alpha_orig, beta_orig)
     return v, best_move
+
+
+build_policy()